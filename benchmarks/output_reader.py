@@ -0,0 +1,70 @@
+"""
+Stream mixed spider output through OutputReader and report throughput and
+peak memory.
+
+The child process prints short log lines, multi-megabyte single-line HTML
+dumps and random binary data (invalid UTF-8 included) until the requested
+volume is reached.
+
+Usage:
+    python benchmarks/output_reader.py [megabytes]   # default: 1024
+"""
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from requests_entrypoint.output import OutputReader  # noqa: E402
+
+CHILD = """
+import os, sys
+total = int(sys.argv[1])
+short = b"".join(b"INFO item %d scraped ok\\n" % i for i in range(20000))
+huge = b"<html>" + b"<div>row</div>" * (4 * 1024 * 1024 // 14) + b"</html>\\n"
+binary = os.urandom(256 * 1024)
+block = short + huge + binary + b"\\n"
+out = sys.stdout.buffer
+written = 0
+while written < total:
+    out.write(block)
+    written += len(block)
+out.flush()
+"""
+
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    process = subprocess.Popen(
+        [sys.executable, "-c", CHILD, str(megabytes * 1024 * 1024)],
+        stdout=subprocess.PIPE,
+        bufsize=0,
+    )
+    emitted = {"chars": 0, "longest": 0}
+
+    def emit(line):
+        emitted["chars"] += len(line)
+        emitted["longest"] = max(emitted["longest"], len(line))
+
+    reader = OutputReader(process.stdout, emit)
+    start = time.perf_counter()
+    reader.read()
+    elapsed = time.perf_counter() - start
+    process.wait()
+
+    if reader.exception is not None:
+        raise reader.exception
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"bytes read:       {reader.bytes_read / 1024 / 1024:.1f} MiB")
+    print(f"lines read:       {reader.lines}")
+    print(f"fragments logged: {reader.fragments}")
+    print(f"longest emitted:  {emitted['longest']} chars")
+    print(f"elapsed:          {elapsed:.2f} s")
+    print(f"throughput:       {reader.bytes_read / 1024 / 1024 / elapsed:.1f} MiB/s")
+    print(f"peak RSS:         {peak_rss:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,37 +15,54 @@ def execute(args, hdlr):
 
     python spider.py
     """
+    from requests_entrypoint.job_summary import job_summary
+    from requests_entrypoint.log import SpiderOutputLogger, flush_log_tail
+    from requests_entrypoint.output import OutputReader
     command = " ".join(args)
     logger.info("Running command: %s", command)
-    process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=os.environ)
-    for line in process.stdout:
-        logger.info("%s", line)
-    for line in process.stderr:
-        logger.error("%s", line)
+    process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0, env=os.environ)
+    readers = [
+        OutputReader(process.stdout, SpiderOutputLogger(logger, logging.INFO)),
+        OutputReader(process.stderr, SpiderOutputLogger(logger, logging.ERROR)),
+    ]
+    for thread in [reader.start() for reader in readers]:
+        thread.join()
     returncode = process.wait()
+    job_summary.spider_exit_code = returncode
+    job_summary.add_output("stdout", readers[0])
+    job_summary.add_output("stderr", readers[1])
     if returncode != 0:
+        flush_log_tail()
         raise SpiderCodeException(f"Spider code returned non-zero exit code: {returncode}")
+    for reader in readers:
+        if reader.exception is not None:
+            raise reader.exception
     logger.info("Successful Spider Requests execution.")
 
 def setup_and_launch():
+    from requests_entrypoint.job_summary import job_summary
     from requests_entrypoint.utils import decode_job, get_args_and_env
     from requests_entrypoint.log import init_logging
+    from requests_entrypoint.resources import log_resource_limits
     from requests_entrypoint.spider_file_helpers import get_file_by_spider_name
     try:
-        job = decode_job()
-        assert job,  "JOB_INFO must be set"
-        job["spider"] = get_file_by_spider_name(os.getcwd(), job["spider"])  # get file name.
-        args, env = get_args_and_env(job)
-        os.environ.update(env)
-        loghdlr = init_logging()
-        loghdlr.setLevel(logging.DEBUG)
+        with job_summary.phase("setup"):
+            job = decode_job()
+            assert job,  "JOB_INFO must be set"
+            job["spider"] = get_file_by_spider_name(os.getcwd(), job["spider"])  # get file name.
+            args, env = get_args_and_env(job)
+            os.environ.update(env)
+            loghdlr = init_logging()
+            loghdlr.setLevel(logging.DEBUG)
+            log_resource_limits(env)
 
     except Exception:
         logging.exception("Environment variables were not defined properly.")
         raise
 
     # run code.
-    execute(args, None)
+    with job_summary.phase("execute"):
+        execute(args, None)
 
 
 def describe_project():
@@ -67,20 +84,30 @@ def report_deploy():
 
 
 def main():
+    from requests_entrypoint.job_summary import job_summary, publish_job_summary
     from requests_entrypoint.utils import producer
+    code = 1
     try:
-        if producer.get_connection():
-            logging.debug("Successful connection to the queue platform.")
-        else:
-            raise Exception("Could not connect to the queue platform.")
+        with job_summary.phase("connect"):
+            if producer.get_connection():
+                logging.debug("Successful connection to the queue platform.")
+            else:
+                raise Exception("Could not connect to the queue platform.")
         setup_and_launch()
         code = 0
     except SystemExit as ex:
+        if ex.code:
+            job_summary.set_failure(ex)
         code = ex.code
     except Exception as ex:
         logger.exception("Unknown Exception: %s", ex)
+        job_summary.set_failure(ex)
         code = 1
     finally:
+        with job_summary.phase("flush"):
+            producer.flush()
+        # Published after the flush so the summary includes its duration.
+        publish_job_summary(producer, code)
         producer.flush()
         producer.close()
     
@@ -0,0 +1,92 @@
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from requests_entrypoint.settings import JOB_SUMMARY_FILE, JOB_SUMMARY_TOPIC
+
+logger = logging.getLogger("requests_entrypoint")
+
+
+def _cpu_time():
+    # Include reaped children so the execute phase accounts for the spider process.
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+class JobSummary:
+    """
+    Collect the outcome of a job while it runs: per-phase wall and CPU
+    time, output volume per stream and bytes shipped to the queue.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.phases = {}
+        self.output = {}
+        self.shipped = {"messages": 0, "bytes": 0}
+        self.failure_class = None
+        self.spider_exit_code = None
+
+    @contextmanager
+    def phase(self, name):
+        wall, cpu = time.perf_counter(), _cpu_time()
+        try:
+            yield
+        finally:
+            self.phases[name] = {
+                "wall_time": round(time.perf_counter() - wall, 6),
+                "cpu_time": round(_cpu_time() - cpu, 6),
+            }
+
+    def add_output(self, stream, reader):
+        self.output[stream] = {
+            "bytes": reader.bytes_read,
+            "lines": reader.lines,
+            "fragments": reader.fragments,
+        }
+
+    def add_shipped(self, size):
+        self.shipped["messages"] += 1
+        self.shipped["bytes"] += size
+
+    def set_failure(self, exception):
+        self.failure_class = type(exception).__name__
+
+    def to_dict(self, exit_code):
+        return {
+            "jid": os.getenv("ESTELA_SPIDER_JOB"),
+            "payload": {
+                "exit_code": exit_code,
+                "spider_exit_code": self.spider_exit_code,
+                "failure_class": self.failure_class,
+                "started": self.started,
+                "finished": time.time(),
+                "phases": self.phases,
+                "output": self.output,
+                "shipped": dict(self.shipped),
+            },
+        }
+
+
+def publish_job_summary(producer, exit_code):
+    """
+    Publish the job summary once to JOB_SUMMARY_TOPIC and, if
+    JOB_SUMMARY_FILE is set, write it to that file.
+    """
+    data = job_summary.to_dict(exit_code)
+    # Write the local copy first so it survives a queue failure.
+    if JOB_SUMMARY_FILE:
+        try:
+            with open(JOB_SUMMARY_FILE, "w") as file:
+                json.dump(data, file)
+        except Exception:
+            logger.exception("Could not write the job summary to %s.", JOB_SUMMARY_FILE)
+    try:
+        producer.send(JOB_SUMMARY_TOPIC, data)
+    except Exception:
+        logger.exception("Could not publish the job summary.")
+
+
+job_summary = JobSummary()
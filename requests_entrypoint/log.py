@@ -1,12 +1,31 @@
 import logging
 import os
+import random
+import re
 import sys
+import threading
 import time
+from collections import deque
 
 from estela_queue_adapter import queue_noisy_libraries
+from requests_entrypoint.job_summary import job_summary
+from requests_entrypoint.settings import (
+    LOG_SAMPLE_RATE,
+    LOG_SAMPLING,
+    LOG_TAIL_BYTES,
+    LOG_TAIL_MESSAGE_BYTES,
+)
 from requests_entrypoint.utils import producer
 
+# LogRecord attribute marking records that sampling may drop.
+SAMPLED = "log_sampled"
+
+# Level names and exception or warning class names found in WARNING+ lines.
+_SEVERE_LINE = re.compile(r"\b(?:WARN|WARNING|ERROR|CRITICAL|FATAL)\b|\w(?:Error|Exception|Warning):")
+_TRACEBACK_START = "Traceback (most recent call last):"
+
 _stderr = sys.stderr
+_tail = None
 
 
 def to_standard_str(text, encoding="utf-8", errors="strict"):
@@ -17,15 +36,52 @@ def to_standard_str(text, encoding="utf-8", errors="strict"):
     return text.decode(encoding, errors)
 
 
-def _logfn(level, message, parent="none"):
+def _send_log(message, datetime):
     data = {
         "jid": os.getenv("ESTELA_SPIDER_JOB"),
-        "payload": {"log": str(message), "datetime": float(time.time())},
+        "payload": {"log": message, "datetime": datetime},
     }
     producer.send("job_logs", data)
+    job_summary.add_shipped(len(message.encode("utf-8", "replace")))
+
+
+def _logfn(level, message, parent="none", sampled=False):
+    message = str(message)
+    datetime = float(time.time())
+    if _tail is not None:
+        # Keep every line in the tail, but only ship a sample of the records
+        # marked as sampled.
+        _tail.append(message, datetime)
+        if sampled and random.random() >= LOG_SAMPLE_RATE:
+            return
+    _send_log(message, datetime)
+
+
+def flush_log_tail():
+    """
+    Ship the buffered tail of recent log lines to job_logs in as few
+    messages as possible, each at most LOG_TAIL_MESSAGE_BYTES long.
+
+    Errors are logged and swallowed so they never replace the spider's failure.
+    """
+    if _tail is None:
+        return
+    try:
+        batches = _tail.drain()
+        for index, batch in enumerate(batches, 1):
+            header = "[tail] Last {} log lines before failure ({}/{}):".format(
+                sum(len(lines) for lines in batches), index, len(batches)
+            )
+            _send_log("\n".join([header] + batch), float(time.time()))
+    except Exception:
+        logging.getLogger("requests_entrypoint").exception("Could not ship the log tail.")
 
 
 def init_logging():
+    global _tail
+    if LOG_SAMPLING:
+        _tail = LogTail(LOG_TAIL_BYTES, LOG_TAIL_MESSAGE_BYTES)
+
     # General python logging
     root = logging.getLogger()
     root.setLevel(
@@ -48,6 +104,85 @@ def init_logging():
     return hdlr
 
 
+class LogTail:
+    """
+    Bounded ring buffer of the most recent log lines, measured in bytes of
+    the rendered lines (timestamp prefix and newline included)
+    """
+
+    # Room left in each batch for the header line.
+    HEADER_BYTES = 128
+
+    def __init__(self, max_bytes, max_batch_bytes):
+        if max_batch_bytes <= self.HEADER_BYTES:
+            raise ValueError(
+                "LOG_TAIL_MESSAGE_BYTES must be greater than {}".format(self.HEADER_BYTES)
+            )
+        self.max_bytes = max_bytes
+        self.max_line_bytes = max_batch_bytes - self.HEADER_BYTES
+        self.size = 0
+        self.lines = deque()
+        self.lock = threading.Lock()
+
+    def append(self, message, datetime):
+        line = "{} {}".format(time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(datetime)), message)
+        encoded = line.encode("utf-8", "replace")
+        if len(encoded) > self.max_line_bytes:
+            line = encoded[: self.max_line_bytes].decode("utf-8", "ignore")
+            encoded = line.encode("utf-8")
+        size = len(encoded) + 1
+        with self.lock:
+            self.lines.append((line, size))
+            self.size += size
+            while self.size > self.max_bytes and self.lines:
+                self.size -= self.lines.popleft()[1]
+
+    def drain(self):
+        """Empty the buffer and return its lines split into size-bounded batches."""
+        with self.lock:
+            lines = list(self.lines)
+            self.lines.clear()
+            self.size = 0
+        batches, batch, batch_size = [], [], 0
+        for line, size in lines:
+            if batch and batch_size + size > self.max_line_bytes:
+                batches.append(batch)
+                batch, batch_size = [], 0
+            batch.append(line)
+            batch_size += size
+        if batch:
+            batches.append(batch)
+        return batches
+
+
+class SpiderOutputLogger:
+    """
+    Log the lines of one spider output stream. The severity of the pipe says
+    nothing about the line (Python logging writes INFO to stderr), so lines
+    are marked as sampled unless they look like WARNING or above: a level
+    name, an exception or warning class, or a traceback.
+    """
+
+    def __init__(self, logger, level):
+        self.logger = logger
+        self.level = level
+        self.in_traceback = False
+
+    def __call__(self, line):
+        self.logger.log(self.level, "%s", line, extra={SAMPLED: not self.is_severe(line)})
+
+    def is_severe(self, line):
+        if line.startswith(_TRACEBACK_START):
+            self.in_traceback = True
+            return True
+        if self.in_traceback:
+            # Frames are indented; the first unindented line is the exception.
+            if not line[:1].isspace():
+                self.in_traceback = False
+            return True
+        return _SEVERE_LINE.search(line) is not None
+
+
 class LogHandler(logging.Handler):
     """Python logging handler"""
 
@@ -55,7 +190,12 @@ class LogHandler(logging.Handler):
         try:
             message = self.format(record)
             if message:
-                _logfn(message=message, level=record.levelno, parent="LogHandler")
+                _logfn(
+                    message=message,
+                    level=record.levelno,
+                    parent="LogHandler",
+                    sampled=getattr(record, SAMPLED, False),
+                )
         except (KeyboardInterrupt, SystemExit):
             raise
         except:
@@ -0,0 +1,97 @@
+import codecs
+import threading
+
+from requests_entrypoint.settings import (
+    OUTPUT_CHUNK_SIZE,
+    OUTPUT_DECODE_ERRORS,
+    OUTPUT_ENCODING,
+    OUTPUT_MAX_LINE_LENGTH,
+)
+
+CONTINUED_SUFFIX = " [...]"
+CONTINUATION_PREFIX = "[...] "
+
+
+class OutputReader:
+    """
+    Read a subprocess pipe as raw bytes and emit decoded lines.
+
+    Bytes are read in chunks of chunk_size and decoded incrementally with
+    the given error policy, so invalid bytes never break the stream. Lines
+    longer than max_line_length are emitted as bounded fragments: every
+    fragment but the last ends with CONTINUED_SUFFIX and every fragment but
+    the first starts with CONTINUATION_PREFIX. Peak memory is therefore
+    bounded by chunk_size and max_line_length, whatever the child prints.
+
+    lines counts the lines read and fragments the messages emitted for them.
+    """
+
+    def __init__(
+        self,
+        stream,
+        emit,
+        encoding=OUTPUT_ENCODING,
+        errors=OUTPUT_DECODE_ERRORS,
+        chunk_size=OUTPUT_CHUNK_SIZE,
+        max_line_length=OUTPUT_MAX_LINE_LENGTH,
+    ):
+        self.stream = stream
+        self.emit = emit
+        self.decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+        self.chunk_size = chunk_size
+        self.max_line_length = max_line_length
+        self.buf = ""
+        self.continued = False
+        self.bytes_read = 0
+        self.lines = 0
+        self.fragments = 0
+        self.exception = None
+
+    def feed(self, data, final=False):
+        lines = (self.buf + self.decoder.decode(data, final)).split("\n")
+        self.buf = lines.pop()
+        for line in lines:
+            self._emit_line(line.rstrip("\r"), complete=True)
+        while len(self.buf) > self.max_line_length:
+            self._emit_fragment(self.buf[: self.max_line_length], complete=False)
+            self.buf = self.buf[self.max_line_length :]
+        if final and (self.buf or self.continued):
+            self._emit_line(self.buf, complete=True)
+            self.buf = ""
+
+    def read(self):
+        try:
+            while True:
+                chunk = self.stream.read(self.chunk_size)
+                if not chunk:
+                    break
+                self.bytes_read += len(chunk)
+                self.feed(chunk)
+            self.feed(b"", final=True)
+        except Exception as ex:
+            # Keep draining the pipe so the child never blocks on a full buffer.
+            self.exception = ex
+            while self.stream.read(self.chunk_size):
+                pass
+
+    def start(self):
+        thread = threading.Thread(target=self.read, daemon=True)
+        thread.start()
+        return thread
+
+    def _emit_line(self, line, complete):
+        while len(line) > self.max_line_length:
+            self._emit_fragment(line[: self.max_line_length], complete=False)
+            line = line[self.max_line_length :]
+        self._emit_fragment(line, complete)
+
+    def _emit_fragment(self, text, complete):
+        if self.continued:
+            text = CONTINUATION_PREFIX + text
+        if not complete:
+            text += CONTINUED_SUFFIX
+        self.continued = not complete
+        self.fragments += 1
+        if complete:
+            self.lines += 1
+        self.emit(text)
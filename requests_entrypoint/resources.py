@@ -0,0 +1,154 @@
+import logging
+import math
+import os
+from typing import Dict, Optional
+
+from requests_entrypoint.settings import (
+    CGROUP_ROOT,
+    HTTP_CONCURRENCY_PER_CPU,
+    MALLOC_ARENAS_PER_CPU,
+    MEMORY_SOFT_LIMIT_RATIO,
+)
+
+logger = logging.getLogger("requests_entrypoint")
+
+# cgroup v1 reports "no limit" as a huge page-aligned number instead of "max".
+_CGROUP_V1_UNLIMITED = 1 << 62
+
+
+def _read_first_line(path: str) -> Optional[str]:
+    try:
+        with open(path, "r") as file:
+            return file.readline().strip()
+    except (OSError, ValueError):
+        return None
+
+
+def _host_cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _host_memory() -> Optional[int]:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def read_cpu_quota(root: str = CGROUP_ROOT) -> Optional[float]:
+    """
+    Return the CPU quota of the cgroup as a number of CPUs, or None if
+    the cgroup does not limit CPU usage.
+
+    Supports both cgroup v2 (cpu.max) and cgroup v1 (cpu.cfs_quota_us
+    and cpu.cfs_period_us).
+    """
+    cpu_max = _read_first_line(os.path.join(root, "cpu.max"))
+    if cpu_max is not None:
+        fields = cpu_max.split()
+        if not fields or fields[0] == "max":
+            return None
+        try:
+            quota = int(fields[0])
+            period = int(fields[1]) if len(fields) > 1 else 100000
+        except ValueError:
+            return None
+        return quota / period if quota > 0 and period > 0 else None
+
+    for controller in ("cpu", "cpu,cpuacct"):
+        quota = _read_first_line(os.path.join(root, controller, "cpu.cfs_quota_us"))
+        period = _read_first_line(os.path.join(root, controller, "cpu.cfs_period_us"))
+        if quota is None or period is None:
+            continue
+        try:
+            quota, period = int(quota), int(period)
+        except ValueError:
+            return None
+        return quota / period if quota > 0 and period > 0 else None
+    return None
+
+
+def read_memory_limit(root: str = CGROUP_ROOT) -> Optional[int]:
+    """
+    Return the memory limit of the cgroup in bytes, or None if the cgroup
+    does not limit memory usage.
+
+    Supports both cgroup v2 (memory.max) and cgroup v1
+    (memory.limit_in_bytes).
+    """
+    for path in (
+        os.path.join(root, "memory.max"),
+        os.path.join(root, "memory", "memory.limit_in_bytes"),
+    ):
+        value = _read_first_line(path)
+        if value is None:
+            continue
+        if value == "max":
+            return None
+        try:
+            limit = int(value)
+        except ValueError:
+            return None
+        if limit <= 0 or limit >= _CGROUP_V1_UNLIMITED:
+            return None
+        host_memory = _host_memory()
+        if host_memory and limit >= host_memory:
+            return None
+        return limit
+    return None
+
+
+def get_resource_limits(root: str = CGROUP_ROOT) -> Dict[str, Optional[int]]:
+    """
+    Compute the effective resources available to the spider process.
+
+    The CPU count is the smaller of the CPUs this process may run on and
+    the cgroup CPU quota (rounded up). The memory limit is None when the
+    container is not memory constrained.
+    """
+    cpu_count = _host_cpu_count()
+    cpu_quota = read_cpu_quota(root)
+    if cpu_quota is not None:
+        cpu_count = max(1, min(cpu_count, math.ceil(cpu_quota)))
+    return {
+        "cpu_count": cpu_count,
+        "memory_limit": read_memory_limit(root),
+    }
+
+
+def get_resource_env(limits: Dict[str, Optional[int]]) -> Dict[str, str]:
+    """
+    Build the environment hints exported to the spider process so thread
+    pools, connection pools and allocator arenas are sized to the container
+    instead of the host.
+
+    MALLOC_ARENA_MAX is only suggested if it is not already set.
+    """
+    cpu_count = limits["cpu_count"]
+    env = {
+        "ESTELA_CPU_COUNT": str(cpu_count),
+        "ESTELA_HTTP_CONCURRENCY": str(max(1, cpu_count * HTTP_CONCURRENCY_PER_CPU)),
+    }
+    if "MALLOC_ARENA_MAX" not in os.environ:
+        env["MALLOC_ARENA_MAX"] = str(max(2, cpu_count * MALLOC_ARENAS_PER_CPU))
+    if limits["memory_limit"] is not None:
+        env["ESTELA_MEMORY_LIMIT"] = str(limits["memory_limit"])
+        env["ESTELA_MEMORY_SOFT_LIMIT"] = str(
+            int(limits["memory_limit"] * MEMORY_SOFT_LIMIT_RATIO)
+        )
+    return env
+
+
+def log_resource_limits(env: Dict[str, str]):
+    logger.info(
+        "Effective resource limits: cpus=%s, http_concurrency=%s, "
+        "malloc_arena_max=%s, memory_limit=%s, memory_soft_limit=%s",
+        env.get("ESTELA_CPU_COUNT"),
+        env.get("ESTELA_HTTP_CONCURRENCY"),
+        env.get("MALLOC_ARENA_MAX", os.getenv("MALLOC_ARENA_MAX")),
+        env.get("ESTELA_MEMORY_LIMIT", "unlimited"),
+        env.get("ESTELA_MEMORY_SOFT_LIMIT", "unlimited"),
+    )
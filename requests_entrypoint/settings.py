@@ -1,3 +1,22 @@
 import os
 
 BLOCKED_NAMES = os.getenv("BLOCKED_NAMES", "setup.py,__init__.py,__main__.py,main.py").split(",")
+
+CGROUP_ROOT = os.getenv("CGROUP_ROOT", "/sys/fs/cgroup")
+HTTP_CONCURRENCY_PER_CPU = int(os.getenv("HTTP_CONCURRENCY_PER_CPU", "8"))
+MALLOC_ARENAS_PER_CPU = int(os.getenv("MALLOC_ARENAS_PER_CPU", "2"))
+MEMORY_SOFT_LIMIT_RATIO = float(os.getenv("MEMORY_SOFT_LIMIT_RATIO", "0.85"))
+
+LOG_SAMPLING = os.getenv("LOG_SAMPLING", "false").lower() == "true"
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.1"))
+LOG_TAIL_BYTES = int(os.getenv("LOG_TAIL_BYTES", str(512 * 1024)))
+# Kept well under Kafka's default 1 MiB message limit to leave room for JSON escaping.
+LOG_TAIL_MESSAGE_BYTES = int(os.getenv("LOG_TAIL_MESSAGE_BYTES", str(256 * 1024)))
+
+OUTPUT_ENCODING = os.getenv("OUTPUT_ENCODING", "utf-8")
+OUTPUT_DECODE_ERRORS = os.getenv("OUTPUT_DECODE_ERRORS", "replace")
+OUTPUT_CHUNK_SIZE = int(os.getenv("OUTPUT_CHUNK_SIZE", str(64 * 1024)))
+OUTPUT_MAX_LINE_LENGTH = int(os.getenv("OUTPUT_MAX_LINE_LENGTH", str(64 * 1024)))
+
+JOB_SUMMARY_TOPIC = os.getenv("JOB_SUMMARY_TOPIC", "job_summary")
+JOB_SUMMARY_FILE = os.getenv("JOB_SUMMARY_FILE", "")
@@ -2,6 +2,8 @@ import json
 import inspect
 import os
 
+from requests_entrypoint.resources import get_resource_env, get_resource_limits
+
 def decode_job():
     job_data = os.getenv("JOB_INFO", "")
     if job_data.startswith("{"):
@@ -19,6 +21,7 @@ def get_args_and_env(msg):
         "ESTELA_UNIQUE_COLLECTION": msg["unique"],
         "ESTELA_CONTEXT": "remote",
     }
+    env.update(get_resource_env(get_resource_limits()))
     return args, env
 
 def setup_scrapy_conf():
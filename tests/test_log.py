@@ -0,0 +1,116 @@
+import logging
+
+import pytest
+
+pytest.importorskip("estela_queue_adapter")
+
+from requests_entrypoint import log  # noqa: E402
+from requests_entrypoint.log import LogTail, SpiderOutputLogger  # noqa: E402
+
+# Rendered lines are prefixed with "%Y-%m-%d %H:%M:%S " and end with a newline.
+RENDERED_OVERHEAD = 21
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    messages = []
+    monkeypatch.setattr(log.producer, "send", lambda topic, data: messages.append(data))
+    return messages
+
+
+@pytest.fixture
+def tail(monkeypatch):
+    tail = LogTail(max_bytes=1024 * 1024, max_batch_bytes=256 * 1024)
+    monkeypatch.setattr(log, "_tail", tail)
+    monkeypatch.setattr(log, "LOG_SAMPLE_RATE", 0.1)
+    monkeypatch.setattr(log.random, "random", lambda: 0.5)
+    return tail
+
+
+def test_tail_evicts_oldest_lines_by_rendered_size():
+    tail = LogTail(max_bytes=3 * (RENDERED_OVERHEAD + 10), max_batch_bytes=1024)
+    for i in range(5):
+        tail.append("line {:05d}".format(i), 0.0)
+    assert tail.size <= tail.max_bytes
+    lines = [line for batch in tail.drain() for line in batch]
+    assert [line[-10:] for line in lines] == ["line 00002", "line 00003", "line 00004"]
+
+
+def test_tail_truncates_line_longer_than_a_batch():
+    tail = LogTail(max_bytes=10000, max_batch_bytes=LogTail.HEADER_BYTES + 100)
+    tail.append("é" * 1000, 0.0)
+    (batch,) = tail.drain()
+    assert len(batch[0].encode("utf-8")) <= 100
+
+
+def test_tail_drain_splits_batches_under_message_bytes():
+    tail = LogTail(max_bytes=10000, max_batch_bytes=LogTail.HEADER_BYTES + 100)
+    for i in range(20):
+        tail.append("line {:05d}".format(i), 0.0)
+    batches = tail.drain()
+    assert len(batches) > 1
+    assert sum(len(batch) for batch in batches) == 20
+    for batch in batches:
+        assert sum(len(line.encode("utf-8")) + 1 for line in batch) <= 100
+    assert tail.drain() == []
+
+
+def test_tail_rejects_message_bytes_not_above_header():
+    with pytest.raises(ValueError):
+        LogTail(max_bytes=10000, max_batch_bytes=LogTail.HEADER_BYTES)
+
+
+def test_sampled_records_are_dropped_but_kept_in_tail(tail, sent):
+    log._logfn(logging.INFO, "spider line", sampled=True)
+    assert sent == []
+    assert tail.drain()[0][0].endswith("spider line")
+
+
+def test_unsampled_records_are_always_shipped(tail, sent):
+    log._logfn(logging.INFO, "entrypoint line")
+    assert [data["payload"]["log"] for data in sent] == ["entrypoint line"]
+
+
+def test_entrypoint_records_are_never_sampled(tail, sent):
+    handler = log.LogHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = logging.getLogger("test_log.entrypoint")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        logger.info("Running command: python spider.py")
+        SpiderOutputLogger(logger, logging.INFO)("INFO:root:item scraped")
+    finally:
+        logger.removeHandler(handler)
+    assert [data["payload"]["log"] for data in sent] == ["Running command: python spider.py"]
+
+
+def test_spider_output_severity():
+    output = SpiderOutputLogger(logging.getLogger("test_log.output"), logging.ERROR)
+    assert not output.is_severe("INFO:root:item scraped")
+    assert output.is_severe("WARNING:root:careful")
+    assert output.is_severe("2024-01-01 [scraper] ERROR: request failed")
+    assert output.is_severe("spider.py:3: DeprecationWarning: old api")
+    assert output.is_severe("Traceback (most recent call last):")
+    assert output.is_severe('  File "spider.py", line 7, in <module>')
+    assert output.is_severe("ZeroDivisionError: division by zero")
+    assert not output.is_severe("INFO:root:back to normal")
+
+
+def test_flush_log_tail_swallows_send_errors(tail, monkeypatch):
+    def send(topic, data):
+        raise RuntimeError("broker down")
+
+    monkeypatch.setattr(log.producer, "send", send)
+    tail.append("spider line", 0.0)
+    log.flush_log_tail()
+
+
+def test_flush_log_tail_ships_batches_with_header(tail, sent):
+    tail.append("spider line", 0.0)
+    log.flush_log_tail()
+    (data,) = sent
+    header, line = data["payload"]["log"].split("\n")
+    assert header == "[tail] Last 1 log lines before failure (1/1):"
+    assert line.endswith("spider line")
@@ -0,0 +1,71 @@
+import io
+
+from requests_entrypoint.output import CONTINUATION_PREFIX, CONTINUED_SUFFIX, OutputReader
+
+
+class ChunkedStream(io.BytesIO):
+    """Bytes stream whose reads are capped, like a pipe delivering partial chunks."""
+
+    def __init__(self, data, read_size):
+        super().__init__(data)
+        self.read_size = read_size
+
+    def read(self, size=-1):
+        return super().read(min(size, self.read_size))
+
+
+def read_lines(data, chunk_size=4096, **kwargs):
+    lines = []
+    reader = OutputReader(io.BytesIO(data), lines.append, chunk_size=chunk_size, **kwargs)
+    reader.read()
+    return reader, lines
+
+
+def test_long_line_split_with_markers():
+    reader, lines = read_lines(b"abcdefghij\nnext\n", chunk_size=3, max_line_length=4)
+    assert lines == [
+        "abcd" + CONTINUED_SUFFIX,
+        CONTINUATION_PREFIX + "efgh" + CONTINUED_SUFFIX,
+        CONTINUATION_PREFIX + "ij",
+        "next",
+    ]
+    assert reader.lines == 2
+    assert reader.fragments == 4
+
+
+def test_line_of_exactly_max_length_is_not_split():
+    _, lines = read_lines(b"abcd\n", chunk_size=1, max_line_length=4)
+    assert lines == ["abcd"]
+
+
+def test_multibyte_character_split_across_chunks():
+    _, lines = read_lines("ñandú €\n".encode("utf-8"), chunk_size=1)
+    assert lines == ["ñandú €"]
+
+
+def test_crlf_is_stripped():
+    _, lines = read_lines(b"one\r\ntwo\r\n")
+    assert lines == ["one", "two"]
+
+
+def test_trailing_line_without_newline_at_eof():
+    reader, lines = read_lines(b"first\nlast")
+    assert lines == ["first", "last"]
+    assert reader.lines == 2
+    assert reader.bytes_read == 10
+
+
+def test_invalid_bytes_are_replaced():
+    reader, lines = read_lines(b"ok \xff\n", errors="replace")
+    assert lines == ["ok �"]
+    assert reader.exception is None
+
+
+def test_strict_errors_set_exception_and_drain_pipe():
+    lines = []
+    stream = ChunkedStream(b"ok!\n\xff\n" + b"x" * 100, read_size=4)
+    reader = OutputReader(stream, lines.append, errors="strict", chunk_size=4)
+    reader.read()
+    assert isinstance(reader.exception, UnicodeDecodeError)
+    assert lines == ["ok!"]
+    assert stream.read(1) == b""
@@ -0,0 +1,93 @@
+from requests_entrypoint import resources
+from requests_entrypoint.resources import (
+    get_resource_env,
+    get_resource_limits,
+    read_cpu_quota,
+    read_memory_limit,
+)
+
+
+def write(root, path, content):
+    file = root / path
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.write_text(content + "\n")
+
+
+def test_cgroup_v2_cpu_max_unlimited(tmp_path):
+    write(tmp_path, "cpu.max", "max 100000")
+    assert read_cpu_quota(str(tmp_path)) is None
+
+
+def test_cgroup_v2_cpu_max_quota(tmp_path):
+    write(tmp_path, "cpu.max", "250000 100000")
+    assert read_cpu_quota(str(tmp_path)) == 2.5
+
+
+def test_cgroup_v1_cpu_quota_unlimited(tmp_path):
+    write(tmp_path, "cpu,cpuacct/cpu.cfs_quota_us", "-1")
+    write(tmp_path, "cpu,cpuacct/cpu.cfs_period_us", "100000")
+    assert read_cpu_quota(str(tmp_path)) is None
+
+
+def test_cgroup_v1_cpu_quota(tmp_path):
+    write(tmp_path, "cpu/cpu.cfs_quota_us", "150000")
+    write(tmp_path, "cpu/cpu.cfs_period_us", "100000")
+    assert read_cpu_quota(str(tmp_path)) == 1.5
+
+
+def test_cpu_count_capped_by_quota(tmp_path, monkeypatch):
+    monkeypatch.setattr(resources, "_host_cpu_count", lambda: 16)
+    write(tmp_path, "cpu.max", "150000 100000")
+    assert get_resource_limits(str(tmp_path))["cpu_count"] == 2
+
+
+def test_cgroup_v1_memory_unlimited_sentinel(tmp_path):
+    write(tmp_path, "memory/memory.limit_in_bytes", "9223372036854771712")
+    assert read_memory_limit(str(tmp_path)) is None
+
+
+def test_cgroup_v1_memory_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(resources, "_host_memory", lambda: 64 * 1024 ** 3)
+    write(tmp_path, "memory/memory.limit_in_bytes", str(2 * 1024 ** 3))
+    assert read_memory_limit(str(tmp_path)) == 2 * 1024 ** 3
+
+
+def test_memory_limit_at_or_above_host_memory_is_unlimited(tmp_path, monkeypatch):
+    monkeypatch.setattr(resources, "_host_memory", lambda: 8 * 1024 ** 3)
+    write(tmp_path, "memory.max", str(8 * 1024 ** 3))
+    assert read_memory_limit(str(tmp_path)) is None
+    write(tmp_path, "memory.max", str(16 * 1024 ** 3))
+    assert read_memory_limit(str(tmp_path)) is None
+
+
+def test_cgroup_v2_memory_max_unlimited(tmp_path):
+    write(tmp_path, "memory.max", "max")
+    assert read_memory_limit(str(tmp_path)) is None
+
+
+def test_cgroup_v2_memory_max_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(resources, "_host_memory", lambda: 64 * 1024 ** 3)
+    write(tmp_path, "memory.max", str(512 * 1024 ** 2))
+    assert read_memory_limit(str(tmp_path)) == 512 * 1024 ** 2
+
+
+def test_no_cgroup_files(tmp_path):
+    assert read_cpu_quota(str(tmp_path)) is None
+    assert read_memory_limit(str(tmp_path)) is None
+
+
+def test_resource_env(monkeypatch):
+    monkeypatch.delenv("MALLOC_ARENA_MAX", raising=False)
+    env = get_resource_env({"cpu_count": 2, "memory_limit": 1000})
+    assert env["ESTELA_CPU_COUNT"] == "2"
+    assert env["ESTELA_HTTP_CONCURRENCY"] == str(2 * resources.HTTP_CONCURRENCY_PER_CPU)
+    assert env["MALLOC_ARENA_MAX"] == str(max(2, 2 * resources.MALLOC_ARENAS_PER_CPU))
+    assert env["ESTELA_MEMORY_LIMIT"] == "1000"
+    assert env["ESTELA_MEMORY_SOFT_LIMIT"] == str(int(1000 * resources.MEMORY_SOFT_LIMIT_RATIO))
+
+
+def test_resource_env_keeps_preset_malloc_arena_max(monkeypatch):
+    monkeypatch.setenv("MALLOC_ARENA_MAX", "4")
+    env = get_resource_env({"cpu_count": 2, "memory_limit": None})
+    assert "MALLOC_ARENA_MAX" not in env
+    assert "ESTELA_MEMORY_LIMIT" not in env